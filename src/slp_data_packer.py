@@ -2,10 +2,15 @@
 # Licensed under the MIT License.
 """Code to pack required collaterals in YAML and binary formats."""
 
+import array
+import logging
 import pathlib
-import struct
+import sys
+from collections.abc import Generator
+from collections.abc import Iterable
 
 from ruamel.yaml import YAML
+from ruamel.yaml import emitter
 
 import slp_dwarf_parser as dp
 
@@ -65,17 +70,86 @@ yaml.representer.ignore_aliases = lambda *args: True  # noqa: ARG005 # Need to m
 """Disable aliases when dumping YAML"""
 
 
-def gen_bin_yaml_output_frame(out_path: str, frames: list[dp.BfStruct]) -> tuple[str, str]:
-    """Write generated frames to binary and YAML format files. Returns filenames."""
-    cmds = list(frames)
+def _represent_bf_dtype(representer, node):  # noqa: ANN001, ANN202 # Boilerplate code.
+    """Emit a BfDtype as a hex int for the safe dumper, which has no HexInt support."""
+    # On the SLF001 waivers below: "_" prefixed members of dp classes are not really private.
+    return representer.represent_scalar(
+        "tag:yaml.org,2002:int", node._hex_fmt.format(node.get_val())  # noqa: SLF001
+    )
+
+
+def _represent_bf_struct(representer, node):  # noqa: ANN001, ANN202 # Boilerplate code.
+    """Emit a BfStruct from its cached member pairs without the classmethod hop."""
+    return representer.represent_dict(dict(node._yaml_pairs))  # noqa: SLF001
+
+
+def _represent_bf_union(representer, node):  # noqa: ANN001, ANN202 # Boilerplate code.
+    """Emit all representations of a BfUnion from its cached member pairs."""
+    return representer.represent_dict(dict(node._yaml_pairs))  # noqa: SLF001
+
+
+def _build_fast_yaml() -> YAML | None:
+    """Build a C-accelerated dumper for the frame YAML.
+
+    The frame YAML is a debug artifact and needs no round-trip fidelity, so the much
+    faster libyaml-backed safe dumper is used whenever its bindings are importable.
+    Returns None otherwise, making the caller fall back to the round-trip instance.
+    """
+    fast = YAML(typ="safe", pure=False)
+    if fast.Emitter is emitter.Emitter:
+        # ruamel falls back to its pure emitter silently when the bindings are
+        # missing, so compare against it instead of probing with a dump.
+        logging.info("libyaml bindings not available, using the pure python YAML dumper")
+        return None
+
+    # Match the emitter settings of the round-trip instance above. These must be
+    # assigned before the representer is first touched; the YAML properties bake
+    # them into the representer/serializer on first instantiation.
+    fast.default_flow_style = False
+    fast.indent(mapping=2, sequence=4, offset=2)
 
+    fast.representer.add_representer(dp.BfStruct, _represent_bf_struct)
+    fast.representer.add_representer(dp.BfUnion, _represent_bf_union)
+    fast.representer.add_representer(dp.BfDtype, _represent_bf_dtype)
+    # BfArray needs vsc raw mode for iteration, which its classmethod already handles
+    fast.representer.add_representer(dp.BfArray, dp.BfArray.to_yaml)
+
+    fast.representer.ignore_aliases = lambda *args: True  # noqa: ARG005 # Need to match function signature.
+    # The safe representer sorts mapping keys; keep declaration order like round-trip
+    fast.representer.sort_base_mapping_type_on_output = False
+    return fast
+
+
+fast_yaml = _build_fast_yaml()
+"""C-accelerated dumper for frames. None when the libyaml bindings are unavailable."""
+
+
+def _collect_frames(
+    frames: Iterable[dp.BfStruct], words: array.array
+) -> Generator[dp.BfStruct]:
+    """Collect the 32-bit words of each frame, yielding it on for YAML serialization."""
+    for cmd in frames:
+        words.extend(u32.get_val() for u32 in cmd.data)
+        yield cmd
+
+
+def gen_bin_yaml_output_frame(out_path: str, frames: Iterable[dp.BfStruct]) -> tuple[str, str]:
+    """Write generated frames to binary and YAML format files. Returns filenames.
+
+    The frames iterable is consumed exactly once: each frame's words are collected as
+    it is emitted into the YAML document stream, so only one packed buffer -- not a
+    snapshot of the frame objects -- is ever held in memory. The words of all frames
+    are then written out with a single call.
+    """
+    words = array.array("I")
     with pathlib.Path(name_yml := out_path + SUFFIX_YML_FRAME).open(mode="w") as yml_file:
-        yaml.dump(cmds, yml_file)
+        (fast_yaml or yaml).dump_all(_collect_frames(frames, words), yml_file)
+
+    if sys.byteorder != "little":
+        words.byteswap()
 
     with pathlib.Path(name_bin := out_path + SUFFIX_BIN_FRAME).open(mode="wb") as bin_file:
-        for cmd in cmds:
-            for u32 in cmd.data:
-                bin_file.write(struct.pack("<I", u32.get_val()))
+        words.tofile(bin_file)
     return name_bin, name_yml
 
 
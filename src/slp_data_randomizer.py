@@ -2,25 +2,72 @@
 # Licensed under the MIT License.
 """Code to generate random data."""
 
+import mmap
 import os
 import pathlib
 import random
 import shutil
-import struct
+import sys
 from enum import Enum
 
+import numpy as np
+
 import slp_data_packer as data_packer
 
 DEF_SIZE = 1024 * 1024  # 1MB
 """Generate 1MB data by default."""
 
-CHUNK_SIZE = 1024  # 1KB
-"""The maximum size that os.urandom can be called at once."""
+CHUNK_SIZE = 128 * 1024  # 128KB
+"""The size of each os.urandom request.
+
+os.urandom handles arbitrary sizes; large chunks amortize the syscall and
+allocation cost per request without holding too much in memory at once.
+"""
+
+WRITE_BUF_SIZE = 1024 * 1024  # 1MB
+"""Buffer size for the output file so kernel writes are batched."""
+
+MMAP_THRESHOLD = 4 * 1024 * 1024  # 4MB
+"""Outputs at least this large go through a memory map; setup cost dominates below it."""
 
 STD_OFFSET = 0xCAFE0000
 """The default offset that the binary file will start with for first byte of data."""
 
 
+class _UrandomPool:
+    """Process-wide entropy buffer that refills from os.urandom in large blocks.
+
+    Amortizes the kernel round-trip over many small requests when randomize_data runs
+    once per test. Fine for the fuzzing-style randomness generated here; not for keys.
+    """
+
+    REFILL_SIZE = 1024 * 1024  # 1MB
+    """The size of each refill from os.urandom."""
+
+    def __init__(self: "_UrandomPool") -> None:
+        """Start with an empty buffer; it is filled on the first read."""
+        self._buf = b""
+        self._idx = 0
+
+    def read(self: "_UrandomPool", num_bytes: int) -> bytes | memoryview:
+        """Return num_bytes of random data, refilling the pool when exhausted."""
+        if num_bytes >= self.REFILL_SIZE:
+            # Requests of at least a full refill gain nothing from pooling
+            return os.urandom(num_bytes)
+
+        if self._idx + num_bytes > len(self._buf):
+            self._buf = os.urandom(self.REFILL_SIZE)
+            self._idx = 0
+
+        view = memoryview(self._buf)[self._idx : self._idx + num_bytes]
+        self._idx += num_bytes
+        return view
+
+
+urandom_pool = _UrandomPool()
+"""Shared entropy pool for all random data generation in this process."""
+
+
 class SlpDataPattern(Enum):
     """Enum for the data pattern to be used."""
 
@@ -50,11 +97,7 @@ def randomize_data(
         num_bytes = DEF_SIZE
 
     if pattern == SlpDataPattern.SLP_DATA_PATTERN_ALL_RND:
-        with pathlib.Path.open(filename, "wb") as fout:
-            for _ in range(num_bytes // CHUNK_SIZE):
-                fout.write(os.urandom(CHUNK_SIZE))
-            fout.write(os.urandom(num_bytes % CHUNK_SIZE))
-
+        _write_random(filename, num_bytes)
         return filename, num_bytes
 
     # Figure out the increment for each data entry from previous one
@@ -72,8 +115,51 @@ def randomize_data(
     ):
         offset = STD_OFFSET
 
-    with pathlib.Path(filename).open(mode="wb") as fout:
-        for x in range(num_bytes // 4):
-            fout.write(struct.pack("<I", (offset + incr * x) & 0xFFFF_FFFF))
+    # Compute the whole ramp as one uint32 array in C rather than a Python loop
+    # with a struct.pack and a write per word. The cast to uint32 wraps modulo
+    # 2**32, which provides the 32-bit mask for free.
+    ramp = (offset + incr * np.arange(num_bytes // 4, dtype=np.int64)).astype(np.uint32)
+    if sys.byteorder != "little":
+        ramp.byteswap(inplace=True)
+
+    _write_ramp(filename, ramp)
 
     return filename, num_bytes
+
+
+def _write_random(filename: str, num_bytes: int) -> None:
+    """Fill the file with random data, through a memory map for large outputs."""
+    if num_bytes >= MMAP_THRESHOLD:
+        _write_random_mmap(filename, num_bytes)
+        return
+
+    with pathlib.Path(filename).open(mode="wb", buffering=WRITE_BUF_SIZE) as fout:
+        for _ in range(num_bytes // CHUNK_SIZE):
+            fout.write(urandom_pool.read(CHUNK_SIZE))
+        fout.write(urandom_pool.read(num_bytes % CHUNK_SIZE))
+
+
+def _write_ramp(filename: str, ramp: np.ndarray) -> None:
+    """Write the ramp array, through a memory map for large outputs."""
+    if ramp.nbytes >= MMAP_THRESHOLD:
+        with pathlib.Path(filename).open(mode="w+b") as fout:
+            fout.truncate(ramp.nbytes)
+            with mmap.mmap(fout.fileno(), ramp.nbytes) as mapped:
+                np.frombuffer(mapped, dtype=np.uint32)[:] = ramp
+        return
+
+    with pathlib.Path(filename).open(mode="wb") as fout:
+        ramp.tofile(fout)
+
+
+def _write_random_mmap(filename: str, num_bytes: int) -> None:
+    """Fill the file with random data through a memory map.
+
+    One kernel allocation up front, then plain stores; cheaper than write calls
+    for large outputs.
+    """
+    with pathlib.Path(filename).open(mode="w+b") as fout:
+        fout.truncate(num_bytes)
+        with mmap.mmap(fout.fileno(), num_bytes) as mapped:
+            for idx in range(0, num_bytes, CHUNK_SIZE):
+                mapped.write(urandom_pool.read(min(CHUNK_SIZE, num_bytes - idx)))
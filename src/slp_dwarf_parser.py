@@ -8,8 +8,8 @@
 import collections
 import ctypes
 import logging
-import math
 import pathlib
+import weakref
 from typing import Any
 
 import vsc
@@ -49,18 +49,18 @@ enm = None
 types = None
 """Global variable holding all dwarf types once populated by parse_dwarf_from_elf"""
 
-id2obj = {}
-"""Global dictionary to hold references to the parent since vsc does not allow direct ref"""
-
 
 class BfType:
     """Generic object to hold a Sleipnir datatype."""
 
     def __init__(self: "BfType", parent: "BfType" = None) -> None:
-        """Store a reference to the id of the parent and backannotate in the id2obj."""
-        self._parent = id(parent) if parent is not None else None
+        """Store a weak reference to the parent for upwards value propagation.
+
+        A weak reference keeps vsc happy (it cannot handle a direct member ref)
+        while still letting whole trees be garbage collected.
+        """
+        self._parent_ref = weakref.ref(parent) if parent is not None else None
         self._value = 0
-        id2obj[id(parent)] = parent
 
     def get_val(self: "BfType") -> int:
         """Return the value of this type."""
@@ -91,23 +91,33 @@ class BfStruct(BfType):
         """Populate members based on data of the struct parsed from DWARF."""
         super().__init__(parent)
 
+        # Validate and flatten the dwarf members only the first time this dwarf
+        # type is instantiated; later frames of the same type reuse the result.
+        if (members := _struct_member_cache.get(id(dwarf_type))) is None:
+            for key in dwarf_type.names:
+                if key.startswith("_"):
+                    msg = f"Invalid field name: {key}"
+                    raise KeyError(msg)
+            members = _struct_member_cache[id(dwarf_type)] = tuple(
+                zip(
+                    dwarf_type.names,
+                    dwarf_type.types,
+                    dwarf_type.sizes,
+                    dwarf_type.bit_offsets,
+                    strict=True,
+                )
+            )
+
         offsets = collections.OrderedDict()
         _e = collections.OrderedDict()
-        for key, value in dwarf_type.members.items():
-            if key.startswith("_"):
-                msg = f"Invalid field name: {key}"
-                raise KeyError(msg)
-            if not isinstance(value, dc.BitField):
-                msg = f"Struct member {key} is an instance of {value.__class__} and not BitField"
-                raise TypeError(msg)
-
-            member = vsc.rand_attr(create_type_instance(value["type"], parent=self))
+        for key, member_type, e_size, bit_offset in members:
+            member = vsc.rand_attr(create_type_instance(member_type, parent=self))
             # If size is not given in BitField, get it from the struct definiton itself
-            if isinstance(member, BfDtype) and ((e_size := value["size"]) is not None):
+            if isinstance(member, BfDtype) and (e_size is not None):
                 member._size = e_size
 
             _e[key] = member
-            offsets[key] = value["bit_offset"]
+            offsets[key] = bit_offset
 
         # Set the fields as attributes
         for name, field in _e.items():
@@ -121,78 +131,88 @@ class BfStruct(BfType):
             raise ValueError(msg)
 
         self._size = dwarf_type.size
+        self._max_val = 1 << self._size
+
+        # Precompute the per-member layout used by the value-propagation hot paths:
+        # everything except the value itself is constant after construction.
+        self._layout = tuple(
+            (member, offset, member._size, (1 << member._size) - 1)
+            for name, offset in offsets.items()
+            for member in (object.__getattribute__(self, name),)
+        )
+
+        # Reverse map for update_from_member: member identity -> bit placement
+        self._member_index = {
+            id(member): (offset, mask << offset) for member, offset, _, mask in self._layout
+        }
+
+        # Bound accessors so the pack/unpack loops skip the method dispatch too
+        self._getters = tuple((member.get_val, offset) for member, offset, _, _ in self._layout)
+        self._setters = tuple(
+            (member.set_val, offset, mask) for member, offset, _, mask in self._layout
+        )
+
+        # Cached name -> member pairs so serialization skips the descriptor protocol
+        self._yaml_pairs = tuple(_e.items())
+
+        self._rand_children = ()
+        """Subtrees taking part in randomization; refreshed by pre_rand."""
 
     def pre_rand(self: "BfStruct") -> None:
         """Set is_rand only for some fields if they are a union.
 
         For a struct, just call this on all member fields, nothing to do otherwise.
+        Also records which subtrees take part in randomization for post_rand.
         """
-        for attr_name in self._offsets:
-            member = object.__getattribute__(self, attr_name)
+        rand_children = []
+        for member, _, _, _ in self._layout:
             if isinstance(member, BfStruct | BfArray | BfUnion) and member._int_field_info.is_rand:
                 member.pre_rand()
+                rand_children.append(member)
+        self._rand_children = tuple(rand_children)
 
     def post_rand(self: "BfStruct") -> None:
         """Update values after randomization."""
-        for attr_name in self._offsets:
-            member = object.__getattribute__(self, attr_name)
-            if isinstance(member, BfStruct | BfArray | BfUnion) and member._int_field_info.is_rand:
-                member.post_rand()
+        # Only the subtrees pre_rand recorded were randomized; skip the rest
+        for member in self._rand_children:
+            member.post_rand()
 
         new_value = 0
         # Now all values are available, compute self value
-        for attr_name, offset in self._offsets.items():
-            member = object.__getattribute__(self, attr_name)
-            value = member.get_val()
-            new_value |= value << offset
+        for get_val, offset in self._getters:
+            new_value |= get_val() << offset
 
         # Get the value from that member and fan it out to everyone else.
         self.set_val(new_value, from_parent=True)
 
     def set_val(self: "BfStruct", val: int, *, from_parent: bool = False) -> None:
         """Update the value of this struct and its members."""
-        if hasattr(self, "_size") and val >= 2**self._size:
+        if hasattr(self, "_max_val") and val >= self._max_val:
             msg = f"value of {val} exceeds size of {self._size} for member {self!r}."
             raise ValueError(msg)
         self._value = val
 
         # Need to update all member variables to the new value.
-        for name, offset in self._offsets.items():
-            member = object.__getattribute__(self, name)
-            mask = (1 << member._size) - 1
-            member_val = (val >> offset) & mask
-            member.set_val(member_val, from_parent=True)
-
-        if self._parent and not from_parent:
-            parent = id2obj[self._parent]
+        for member_set_val, offset, mask in self._setters:
+            member_set_val((val >> offset) & mask, from_parent=True)
+
+        if self._parent_ref and not from_parent and (parent := self._parent_ref()) is not None:
             parent.update_from_member(self)
 
     def update_from_member(self: "BfStruct", updater: "BfType") -> None:
         """Hook for members to call when their value is updated."""
-        value = updater.get_val()
+        offset, mask = self._member_index[id(updater)]
 
-        def is_updater_name(attr_name: str) -> bool:
-            return object.__getattribute__(self, attr_name) is updater
-
-        name = next(filter(is_updater_name, self._offsets))
-
-        offset = self._offsets[name]
-        # Create a mask with 1s in the bits to be replaced
-        mask = ((1 << updater._size) - 1) << offset
-        # Clear the bits to be replaced in the original number
-        new_value = self._value & ~mask
-        # Shift the replacement bits to the correct position and combine with the original number
-        new_value |= (value << offset) & mask
+        # Clear the bits to be replaced in the original number, then shift the
+        # replacement bits to the correct position and combine with the original number
+        new_value = (self._value & ~mask) | ((updater.get_val() << offset) & mask)
 
         self.set_val(new_value)
 
     @classmethod
     def to_yaml(cls, representer, node):  # noqa: ANN001, ANN206 # Boilerplate code.
         """Let YAML serializer know what to take."""
-        repr_fields = collections.OrderedDict(
-            (k, object.__getattribute__(node, k)) for k in node._offsets
-        )
-        return representer.represent_dict(repr_fields)
+        return representer.represent_dict(dict(node._yaml_pairs))
 
 
 @vsc.randobj
@@ -210,58 +230,64 @@ class BfUnion(BfType):
                 raise KeyError(msg)
             _e[key] = vsc.rand_attr(create_type_instance(value, parent=self))
 
-        # Sanity check: All member elements should have same size
-        bit_sizes = {x._size for x in _e.values() if not isinstance(x, BfDtype)}
-        if len(bit_sizes) != 1:
-            msg = "Union's member elements have different sizes"
-            raise ValueError(msg)
+        # Run the size sanity checks only the first time this dwarf type is
+        # instantiated; later frames of the same type reuse the resolved size.
+        if (bit_size := _union_size_cache.get(id(dwarf_type))) is None:
+            # Sanity check: All member elements should have same size
+            bit_sizes = {x._size for x in _e.values() if not isinstance(x, BfDtype)}
+            if len(bit_sizes) != 1:
+                msg = "Union's member elements have different sizes"
+                raise ValueError(msg)
 
-        # Sanity check: The basic datatypes should have a minimum size as above
-        if not bit_sizes:
-            # Special case: Union of only basic datatypes. Not handled for now.
-            msg = "Union of only basic datatypes unsupported"
-            raise ValueError(msg)
+            # Sanity check: The basic datatypes should have a minimum size as above
+            if not bit_sizes:
+                # Special case: Union of only basic datatypes. Not handled for now.
+                msg = "Union of only basic datatypes unsupported"
+                raise ValueError(msg)
 
-        bit_size = bit_sizes.pop()  # All are same, so just pick the first entry as the size
-        basic_dtypes = filter(lambda x: isinstance(x, BfDtype), _e.values())
+            bit_size = bit_sizes.pop()  # All are same, so just pick the first entry as the size
+            basic_dtypes = filter(lambda x: isinstance(x, BfDtype), _e.values())
 
-        # Assumption: they are all basic datatypes, no good way to check for now
-        if any(x._size < bit_size for x in basic_dtypes):
-            msg = "Basic data type members of this union can hold less than the other ones."
-            raise ValueError(msg)
+            # Assumption: they are all basic datatypes, no good way to check for now
+            if any(x._size < bit_size for x in basic_dtypes):
+                msg = "Basic data type members of this union can hold less than the other ones."
+                raise ValueError(msg)
+
+            _union_size_cache[id(dwarf_type)] = bit_size
 
         self._size = bit_size
+        self._max_val = 1 << bit_size
 
         # Set the fields as attributes
         for name, field in _e.items():
             BfType.__setattr__(self, name, field)
 
+        # Cache the member names so the hot paths below do not have to rediscover
+        # them with dir() scans and isinstance checks on every call.
+        self._member_names = tuple(_e)
+        self._non_dtype_names = tuple(k for k, v in _e.items() if not isinstance(v, BfDtype))
+        self._non_array_names = tuple(
+            k for k in self._non_dtype_names if not isinstance(_e[k], BfArray)
+        )
+
+        # Cached name -> member pairs so serialization skips the descriptor protocol
+        self._yaml_pairs = tuple(_e.items())
+
+        self._rand_member = None
+        """The member selected for randomization; set by pre_rand."""
+
     def pre_rand(self: "BfUnion") -> None:
         """Pick only one field in the union as a randomizable one.
 
         This is to avoid race conditions when randomizer starts setting field values.
         """
-        members = collections.OrderedDict()
-        for attr_name in dir(self):
-            if isinstance(member := object.__getattribute__(self, attr_name), BfType):
-                members[attr_name] = member
-
-        # Second step, filter out BfArray if others are present
-        non_dtype_members = collections.OrderedDict(
-            (k, v) for k, v in members.items() if not isinstance(v, BfDtype)
-        )
-        non_array_members = collections.OrderedDict(
-            (k, v) for k, v in non_dtype_members.items() if not isinstance(v, BfArray)
-        )
-
-        # Use this as the rand_member then
-        if non_array_members:
-            rand_member_name, rand_member = next(iter(non_array_members.items()))
-        else:
-            rand_member_name, rand_member = next(iter(non_dtype_members.items()))
+        # Prefer a non-dtype member, and among those a non-array one
+        rand_member_name = (self._non_array_names or self._non_dtype_names)[0]
+        rand_member = object.__getattribute__(self, rand_member_name)
 
         # Disable randomization on all other members
-        for member_name, member in members.items():
+        for member_name in self._member_names:
+            member = object.__getattribute__(self, member_name)
             if member is not rand_member:
                 member._int_field_info.set_is_rand(False)
                 logging.debug(
@@ -272,6 +298,7 @@ class BfUnion(BfType):
 
         # Enable randomization on the selected member
         rand_member._int_field_info.set_is_rand(True)
+        self._rand_member = rand_member
 
         # Now do the same for rand_member.
         rand_member.pre_rand()
@@ -279,41 +306,29 @@ class BfUnion(BfType):
     def post_rand(self: "BfUnion") -> None:
         """By rule, there is only one member that underwent randomization.
 
-        Find that member and get the value to fan it out.
+        pre_rand recorded that member, so read the value straight from it.
         """
-        for attr_name in dir(self):
-            member = object.__getattribute__(self, attr_name)
-            if isinstance(member, BfStruct | BfArray | BfUnion) and member._int_field_info.is_rand:
-                member.post_rand()
-                new_value = member.get_val()
-                break
-        else:
-            # Random member is of type BfDtype
-            for attr_name in dir(self):
-                member = object.__getattribute__(self, attr_name)
-                if isinstance(member, BfDtype) and member._int_field_info.is_rand:
-                    new_value = member.get_val()
-                    break
-            else:
-                msg = "No member of the union is marked for randomization."
-                raise ValueError(msg)
+        if (member := self._rand_member) is None:
+            msg = "No member of the union is marked for randomization."
+            raise ValueError(msg)
+
+        if isinstance(member, BfStruct | BfArray | BfUnion):
+            member.post_rand()
 
         # Get the value from that member and fan it out to everyone else.
-        self.set_val(new_value, from_parent=True)
+        self.set_val(member.get_val(), from_parent=True)
 
     def set_val(self: "BfUnion", val: int, *, from_parent: bool = False) -> None:
         """Update the value of this union and its members."""
-        if hasattr(self, "_size") and val >= 2**self._size:
+        if hasattr(self, "_max_val") and val >= self._max_val:
             msg = f"value of {val} exceeds size of {self._size} for member {self!r}."
             raise ValueError(msg)
         self._value = val
 
-        for attr_name in dir(self):
-            if isinstance(member := object.__getattribute__(self, attr_name), BfType):
-                member.set_val(val, from_parent=True)
+        for attr_name in self._member_names:
+            object.__getattribute__(self, attr_name).set_val(val, from_parent=True)
 
-        if self._parent and not from_parent:
-            parent = id2obj[self._parent]
+        if self._parent_ref and not from_parent and (parent := self._parent_ref()) is not None:
             parent.update_from_member(self)
 
     def update_from_member(self: "BfUnion", updater: "BfType") -> None:
@@ -327,12 +342,7 @@ class BfUnion(BfType):
         This is tricky for Union, as there are multple representations for the same value.
         Return all representations as this is for debug purposes.
         """
-        repr_fields = {}
-        for name in dir(node):
-            if not isinstance(field := object.__getattribute__(node, name), BfType):
-                continue
-            repr_fields[name] = field
-        return representer.represent_dict(repr_fields)
+        return representer.represent_dict(dict(node._yaml_pairs))
 
 
 class BfDtype(vsc.rand_bit_t, BfType):
@@ -342,16 +352,22 @@ class BfDtype(vsc.rand_bit_t, BfType):
         """Populate members based on datatype parsed from DWARF."""
         BfType.__init__(self, parent)
         vsc.rand_bit_t.__init__(self, w=8 * ctypes.sizeof(dwarf_type))
+        self._cache_size_consts()
+
+    def _cache_size_consts(self: "BfDtype") -> None:
+        """Cache the constants derived from the width that the hot paths need."""
+        self._max_val = 1 << self.width
+        self._hex_width = (self.width + 3) // 4
+        self._hex_fmt = f"0x{{:0{self._hex_width}x}}"
 
     def set_val(self: "BfDtype", val: int, *, from_parent: bool = False) -> None:
         """Update the value of this type."""
-        if val >= 2**self._size:
+        if val >= self._max_val:
             msg = f"value of {val} exceeds size of {self._size} for member {self!r}."
             raise ValueError(msg)
         vsc.rand_bit_t.set_val(self, val)
 
-        if self._parent and not from_parent:
-            parent = id2obj[self._parent]
+        if self._parent_ref and not from_parent and (parent := self._parent_ref()) is not None:
             parent.update_from_member(self)
 
     @property
@@ -362,6 +378,7 @@ class BfDtype(vsc.rand_bit_t, BfType):
     @_size.setter
     def _size(self: "BfDtype", val: int) -> None:
         self.width = val
+        self._cache_size_consts()
 
     def build_field_model(self: "BfDtype", name: str) -> vsc.FieldScalarModel:
         """Overriding this method to avoid recursive call of set_val."""
@@ -380,88 +397,94 @@ class BfDtype(vsc.rand_bit_t, BfType):
     @classmethod
     def to_yaml(cls, representer, node):  # noqa: ANN001, ANN206 # Boilerplate code.
         """Controls YAML representation of this object. Return the value."""
-        return representer.represent_hex_int(
-            HexInt(node.get_val(), width=math.ceil(node._size / 4))
-        )
+        return representer.represent_hex_int(HexInt(node.get_val(), width=node._hex_width))
 
 
 @vsc.randobj
 class BfArray(list, BfType):
     """Holds a C array defined in Sleipnir."""
 
-    def __init__(self: "BfArray", dwarf_type: Any, parent: "BfType" = None) -> None:
+    def __init__(self: "BfArray", dwarf_type: dc.Array, parent: "BfType" = None) -> None:
         """Populate members based on data of the array parsed from DWARF."""
         BfType.__init__(self, parent)
 
-        for idx, element in enumerate(dwarf_type):
+        shape = dwarf_type.shape
+        # Multi-dimensional arrays hold arrays of the remaining dimensions
+        element = dwarf_type.elem if len(shape) == 1 else _inner_array_type(dwarf_type)
+        for idx in range(shape[0]):
             member = create_type_instance(element, parent=self)
             field = vsc.rand_attr(member)
             list.append(self, field)
             list.__setattr__(self, f"idx_{idx}", field)
 
+        # All elements are of the same type, so cache their common size once
+        self._elem_size = list.__getitem__(self, 0)._size if len(self) else 0
+        self._max_val = 1 << self._size
+
+        # Reverse map for update_from_member: member identity -> element index
+        self._member_index = {id(member): index for index, member in enumerate(self)}
+
+        self._rand_children = ()
+        """Subtrees taking part in randomization; refreshed by pre_rand."""
+
     @property
     def _size(self: "BfArray") -> int:
         """Return the size of this instance in bits."""
-        with vsc.raw_mode():
-            return self[0]._size * len(self)
+        return self._elem_size * len(self)
 
     def pre_rand(self: "BfArray") -> None:
         """Set is_rand only for some fields if they are a union.
 
         For a struct, just call this on all member fields, nothing to do otherwise.
+        Also records which subtrees take part in randomization for post_rand.
         """
+        rand_children = []
         for member in self:
             if isinstance(member, BfStruct | BfArray | BfUnion) and member._int_field_info.is_rand:
                 member.pre_rand()
+                rand_children.append(member)
+        self._rand_children = tuple(rand_children)
 
     def post_rand(self: "BfArray") -> None:
         """Update values after randomization."""
-        for member in self:
-            if isinstance(member, BfStruct | BfArray | BfUnion) and member._int_field_info.is_rand:
-                member.post_rand()
+        # Only the subtrees pre_rand recorded were randomized; skip the rest
+        for member in self._rand_children:
+            member.post_rand()
 
         new_value = 0
+        size = self._elem_size
         # Now all values are available, compute self value
         for index, member in enumerate(self):
-            value = member.get_val()
-            offset = index * member._size
-            new_value |= value << offset
+            new_value |= member.get_val() << (index * size)
 
         # Get the value from that member and fan it out to everyone else.
         self.set_val(new_value, from_parent=True)
 
     def set_val(self: "BfArray", val: int, *, from_parent: bool = False) -> None:
         """Update the value of this struct and its members."""
-        if val >= 2**self._size:
+        if val >= self._max_val:
             msg = f"value of {val} exceeds size of {self._size} for member {self!r}."
             raise ValueError(msg)
         self._value = val
 
-        # Need to update all member variables to the new value.
+        # Elements share one size, so hoist the size and mask out of the loop.
+        size = self._elem_size
+        mask = (1 << size) - 1
         for index, member in enumerate(self):
-            size = member._size
-            offset = size * index
-            mask = (1 << size) - 1
-            member_value = (val >> offset) & mask
-            member.set_val(member_value, from_parent=True)
-
-        if self._parent and not from_parent:
-            parent = id2obj[self._parent]
+            member.set_val((val >> (index * size)) & mask, from_parent=True)
+
+        if self._parent_ref and not from_parent and (parent := self._parent_ref()) is not None:
             parent.update_from_member(self)
 
     def update_from_member(self: "BfArray", updater: "BfType") -> None:
         """Hook for members to call when their value is updated."""
-        value = updater.get_val()
-        index = next(x for x in range(len(self)) if list.__getitem__(self, x) is updater)
-
-        elem_size = updater._size
+        offset = self._member_index[id(updater)] * self._elem_size
 
         # Create a mask with 1s in the bits to be replaced
-        mask = ((1 << elem_size) - 1) << (index * elem_size)
-        # Clear the bits to be replaced in the original number
-        new_value = self._value & ~mask
-        # Shift the replacement bits to the correct position and combine with the original number
-        new_value |= (value << index * elem_size) & mask
+        mask = ((1 << self._elem_size) - 1) << offset
+        # Clear the bits to be replaced in the original number, then shift the
+        # replacement bits to the correct position and combine with the original number
+        new_value = (self._value & ~mask) | ((updater.get_val() << offset) & mask)
 
         self.set_val(new_value)
 
@@ -493,19 +516,60 @@ class BfArray(list, BfType):
             return representer.represent_list(node)
 
 
+_factory_cache = {}
+"""Memoized dwarf type -> BfType subclass dispatch, keyed by id of the dwarf type."""
+
+_struct_member_cache = {}
+"""Validated, flattened struct members, keyed by id of the dwarf type."""
+
+_union_size_cache = {}
+"""Sanity-checked union bit sizes, keyed by id of the dwarf type."""
+
+_array_inner_cache = {}
+"""Inner Array descriptors of multi-dimensional arrays, keyed by id of the outer.
+
+Keying these caches by id is safe because the dwarf types are kept alive by the
+global types dict; all of them are cleared when a new ELF is parsed.
+"""
+
+
+def _inner_array_type(dwarf_type: dc.Array) -> dc.Array:
+    """Return the Array describing all but the first dimension, one per dwarf type."""
+    if (inner := _array_inner_cache.get(id(dwarf_type))) is None:
+        inner = _array_inner_cache[id(dwarf_type)] = dc.Array(
+            dwarf_type.elem, dwarf_type.shape[1:]
+        )
+    return inner
+
+
+def build_factory(type_to_create: Any) -> type:
+    """Return the BfType subclass that holds values for instances of the given type.
+
+    The isinstance cascade runs once per dwarf type instead of once per created
+    instance; frames of the same type hit the memoized dispatch.
+    """
+    if (factory := _factory_cache.get(id(type_to_create))) is not None:
+        return factory
+
+    if isinstance(type_to_create, dc.Struct):
+        factory = BfStruct
+    elif isinstance(type_to_create, dc.Union):
+        factory = BfUnion
+    elif type_to_create in [ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32, ctypes.c_uint64]:
+        factory = BfDtype
+    elif isinstance(type_to_create, dc.Array):
+        factory = BfArray
+    else:
+        msg = f"Unsupported type: object {type_to_create} is of type {type(type_to_create)}"
+        raise ValueError(msg)
+
+    _factory_cache[id(type_to_create)] = factory
+    return factory
+
+
 def create_type_instance(type_to_create: Any, parent: BfType = None) -> BfType:
     """Return a container to hold values for an instance of the type."""
-    if isinstance(type_to_create, dc.Struct):
-        return BfStruct(type_to_create, parent)
-    if isinstance(type_to_create, dc.Union):
-        return BfUnion(type_to_create, parent)
-    if type_to_create in [ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32, ctypes.c_uint64]:
-        return BfDtype(type_to_create, parent)
-    if isinstance(type_to_create, list):
-        # Assumption: All elements of the list are of same type
-        return BfArray(type_to_create, parent)
-    msg = f"Unsupported type: object {type_to_create} is of type {type(type_to_create)}"
-    raise ValueError(msg)
+    return build_factory(type_to_create)(type_to_create, parent)
 
 
 def get_type_obj(types: dict, name: str, parent: BfType = None) -> BfType:
@@ -522,12 +586,12 @@ def parse_dwarf_from_elf(elf_path: str) -> dict:
 
     Currently, it parses enums, structs, unions and typedefs.
     """
-    # Clear the global containers
-    extract_dwarf.extracted_dies = {
-        "types": {},
-        "enums": {},
-    }
-    extract_dwarf.already_extracted_size = {}
+    # The id-keyed caches refer to dwarf types of the previous ELF; drop them so
+    # recycled ids cannot alias across parses.
+    _factory_cache.clear()
+    _struct_member_cache.clear()
+    _union_size_cache.clear()
+    _array_inner_cache.clear()
 
     with pathlib.Path(elf_path).open(mode="rb") as infile:
         return extract_dwarf.process_file_with_pattern(infile)
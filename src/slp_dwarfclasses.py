@@ -2,19 +2,45 @@
 # Licensed under the MIT License.
 """Classes to represent items parsed from DWARF. Overloaded for pyvsc compatibility."""
 
+import array
 import collections
+import dataclasses
+from typing import Any
 
 
-class Struct(dict):
+@dataclasses.dataclass(slots=True)
+class Struct:
     """Used to contain struct members during extraction.
 
-    Precise byte location of members is preserved here.
+    Precise byte location of members is preserved here. The members are stored as
+    parallel columns -- one list entry per member in declaration order -- which packs
+    the data of all members contiguously instead of one BitField object per member.
     """
 
-    def __init__(self: "Struct") -> None:
-        """Store members in an OrderedDict and the size."""
-        self.size = None
-        self.members = collections.OrderedDict()
+    size: int | None = None
+    names: list = dataclasses.field(default_factory=list)
+    types: list = dataclasses.field(default_factory=list)
+    sizes: list = dataclasses.field(default_factory=list)
+    """Bit size per member; None means take it from the member type."""
+
+    bit_offsets: array.array = dataclasses.field(default_factory=lambda: array.array("q"))
+
+    def add_member(self: "Struct", name: str, type: Any, size: int | None, bit_offset: int) -> None:  # noqa: A002, ANN401 # Named after the BitField field; holds any extracted type.
+        """Append one member to the columns."""
+        self.names.append(name)
+        self.types.append(type)
+        self.sizes.append(size)
+        self.bit_offsets.append(bit_offset)
+
+    @property
+    def members(self: "Struct") -> collections.OrderedDict:
+        """Compatibility view of the columns as an OrderedDict of BitFields."""
+        return collections.OrderedDict(
+            (name, BitField(type=type_, size=size, bit_offset=bit_offset))
+            for name, type_, size, bit_offset in zip(
+                self.names, self.types, self.sizes, self.bit_offsets, strict=True
+            )
+        )
 
     def __repr__(self: "Struct") -> str:
         """Emit the member details."""
@@ -22,16 +48,32 @@ class Struct(dict):
 
 
 class Union(dict):
-    """Used to contain union members, as opposed to OrderedDict for struct members."""
+    """Used to contain union members, as opposed to OrderedDict for struct members.
+
+    Stays a dict subclass: its keys are the member names, which vary per union.
+    """
 
     def __repr__(self: "Union") -> str:
         """Emit dict representation but with classname."""
         return f"Union({dict.__repr__(self)})"
 
 
-class BitField(dict):
+@dataclasses.dataclass(slots=True)
+class Array:
+    """Describes a C array as element type plus shape.
+
+    Replaces the nested ``[elem] * dim`` lists, which materialized every element
+    reference up front; one descriptor covers the whole array.
+    """
+
+    elem: Any
+    shape: tuple
+
+
+@dataclasses.dataclass(slots=True)
+class BitField:
     """Used to contain bit fields during struct extraction."""
 
-    def __repr__(self: "BitField") -> str:
-        """Emit dict representation but with classname."""
-        return f"BitField({dict.__repr__(self)})"
+    type: Any
+    size: int | None
+    bit_offset: int
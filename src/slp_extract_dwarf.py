@@ -6,6 +6,7 @@
 
 import collections
 import ctypes
+import functools
 import re
 import sys
 
@@ -17,9 +18,6 @@ import slp_dwarfclasses as dc
 OFFSET_NEG_MASK = 1 << (64 - 1)
 """The mask to check if a number is negative in 2's complement. DWARF uses 64b representation."""
 
-OFFSET_NEG_SUB = 1 << (64)
-"""The value to subtract to get a negative number. DWARF uses 64b 2's complement."""
-
 
 class UnsupportedDieTagException(BaseException):
     """Exception raised when a DIE tag is not supported."""
@@ -32,11 +30,63 @@ extracted_dies = {
 
 already_extracted_size = {}
 
+# Resolved DIEs keyed by (cu_offset, reference address). Typedef chains re-resolve
+# the same references over and over; caching avoids the repeated DIE re-parse.
+_die_cache = {}
+
+# Child DIE tuples keyed by parent offset. iter_children re-parses the children
+# from the stream on every call; shared members are walked more than once.
+_children_cache = {}
+
+_cache_enabled = True
+"""Whether the caches above store new entries; see enable_cache."""
+
+
+def enable_cache(enabled=True):
+    """Turn the extraction caches on or off.
+
+    Disabling trades repeated DIE parsing for a flat memory profile, e.g. when a
+    debug binary is too large for the caches to be worth holding. Lookups still
+    hit whatever was stored while caching was on; clear_caches drops that too.
+    """
+    global _cache_enabled
+    _cache_enabled = enabled
+
+
+def _children_of(die):
+    if die.offset in _children_cache:
+        return _children_cache[die.offset]
+
+    ret = tuple(die.iter_children())
+    if _cache_enabled:
+        _children_cache[die.offset] = ret
+    return ret
+
+
+def clear_caches():
+    """Drop all per-file extraction state.
+
+    Every cache in this module is keyed by DIE offset, which would alias across
+    different input files; process_file_with_pattern scopes them to one file.
+    """
+    extracted_dies["types"].clear()
+    extracted_dies["enums"].clear()
+    already_extracted_size.clear()
+    _die_cache.clear()
+    _children_cache.clear()
+
 
 def process_file_with_pattern(infile):
     """Extract types or enums with names matching provided pattern."""
-    global extracted_dies
+    clear_caches()
+    try:
+        return _process_file(infile)
+    finally:
+        # Free the per-file caches promptly; nothing in them outlives the returned dict.
+        clear_caches()
+
 
+def _process_file(infile):
     elffile = ELFFile(infile)
     if not elffile.has_dwarf_info():
         msg = "File has no DWARF info."
@@ -53,7 +103,7 @@ def process_file_with_pattern(infile):
     }
 
     # Extract all supported types from all compile units.
-    warned_unsupported_die_types = []
+    warned_unsupported_die_types = set()
     supported_types = [
         "DW_TAG_typedef",
         "DW_TAG_structure_type",
@@ -64,6 +114,14 @@ def process_file_with_pattern(infile):
         "types": {},
         "enums": {},
     }
+    # Which result dict each anon entry landed in, so the typedef branch can
+    # rename it directly instead of scanning every result dict per typedef.
+    anon_registry = {}
+
+    def _register_extracted(dst, name, extracted_type):
+        dst[name] = extracted_type
+        if name.startswith("anon_"):
+            anon_registry[name] = dst
 
     def _extract_die(die):
         parent_die = None
@@ -78,11 +136,11 @@ def process_file_with_pattern(infile):
             parent_die = die
             die = get_type_die(die)
             anon_name = get_anon_name(die)
-            for dst in extracted.values():
-                if anon_name in dst:
-                    # Already extracted as anon before typedef name was known
-                    dst[extracted_name] = dst.pop(anon_name)
-                    return
+            dst = anon_registry.pop(anon_name, None)
+            if dst is not None:
+                # Already extracted as anon before typedef name was known
+                dst[extracted_name] = dst.pop(anon_name)
+                return
 
         if die.tag in processors:
             processor = processors[die.tag]
@@ -97,12 +155,14 @@ def process_file_with_pattern(infile):
                 extracted_dies[processor.dst][parent_die.offset] = extracted_dies[processor.dst][
                     die.offset
                 ]
-                extracted[processor.dst][extracted_name] = extracted_dies[processor.dst][die.offset]
+                _register_extracted(
+                    extracted[processor.dst], extracted_name, extracted_dies[processor.dst][die.offset]
+                )
             return
 
         try:
             extracted_type = processor.callback(die)
-            extracted[processor.dst][extracted_name] = extracted_type
+            _register_extracted(extracted[processor.dst], extracted_name, extracted_type)
 
             if parent_die:
                 extracted_dies[processor.dst][parent_die.offset] = extracted_type
@@ -110,9 +170,28 @@ def process_file_with_pattern(infile):
         except UnsupportedDieTagException as e:
             unsupported_tag = e.args[0]
             if unsupported_tag not in warned_unsupported_die_types:
-                warned_unsupported_die_types.append(unsupported_tag)
+                warned_unsupported_die_types.add(unsupported_tag)
                 print(f"WARNING: Unsupported DIE tag={unsupported_tag}")
 
+    def _iter_type_dies(cu):
+        # DFS that only descends where type definitions can live, instead of
+        # parsing every DIE in the unit like cu.iter_DIEs. Deliberately skips
+        # function bodies, so types local to a function are not extracted.
+        descend_tags = frozenset(
+            {
+                "DW_TAG_namespace",
+                "DW_TAG_structure_type",
+                "DW_TAG_union_type",
+                "DW_TAG_class_type",
+            }
+        )
+        stack = list(_children_of(cu.get_top_DIE())[::-1])
+        while stack:
+            child = stack.pop()
+            yield child
+            if child.has_children and child.tag in descend_tags:
+                stack.extend(_children_of(child)[::-1])
+
     # If pubtypes exists, use it for quicker type lookup
     pubtypes = dwarfinfo.get_pubtypes()
     if pubtypes:
@@ -121,9 +200,9 @@ def process_file_with_pattern(infile):
             die = dwarfinfo.get_DIE_from_lut_entry(entry)
             _extract_die(die)
     else:
-        # Iterate over all DIEs in .debug_info
+        # Iterate over the type-carrying DIEs in .debug_info
         for cu in dwarfinfo.iter_CUs():
-            for die in cu.iter_DIEs():
+            for die in _iter_type_dies(cu):
                 if die.tag not in supported_types:
                     # We dump only structs and enums
                     continue
@@ -140,29 +219,65 @@ def process_file_with_pattern(infile):
 
 def extract_type(die):
     global extracted_dies
-    if die.offset in extracted_dies["types"]:
-        return extracted_dies["types"][die.offset]
-
-    if "DW_TAG_typedef" == die.tag:
-        type_die = get_type_die(die)
-        ret = extract_type(type_die)
-    elif "DW_TAG_structure_type" == die.tag:
-        ret = extract_structure(die)
-    elif "DW_TAG_base_type" == die.tag:
-        ret = extract_base_type(die)
-    elif "DW_TAG_array_type" == die.tag:
-        ret = extract_array(die)
-    elif "DW_TAG_enumeration_type" == die.tag:
-        ret = extract_enum_type(die)
-    elif "DW_TAG_union_type" == die.tag:
-        ret = extract_union(die)
+    types_cache = extracted_dies["types"]
+    if die.offset in types_cache:
+        return types_cache[die.offset]
+
+    # Collapse typedef chains iteratively, remembering every intermediate offset
+    # so the terminal type gets cached for the whole chain at once.
+    chain = []
+    while die.tag == "DW_TAG_typedef" and die_has_type(die):
+        chain.append(die.offset)
+        die = get_type_die(die)
+        if die.offset in types_cache:
+            ret = types_cache[die.offset]
+            break
     else:
-        raise UnsupportedDieTagException(die.tag)
+        extractor = _type_extractors.get(die.tag)
+        if extractor is None:
+            raise UnsupportedDieTagException(die.tag)
 
-    extracted_dies["types"][die.offset] = ret
+        ret = extractor(die)
+        if _cache_enabled:
+            types_cache[die.offset] = ret
+
+    if _cache_enabled:
+        for offset in chain:
+            types_cache[offset] = ret
     return ret
 
 
+def _resolve_typedef_chain(die):
+    """Walk a typedef chain to its terminal DIE, returning the visited offsets."""
+    chain = []
+    while die.tag == "DW_TAG_typedef" and die_has_type(die):
+        chain.append(die.offset)
+        die = get_type_die(die)
+    return die, chain
+
+
+def extract_type_and_size(die):
+    """Resolve the type and the size of a DIE with a single typedef-chain walk.
+
+    extract_type and extract_type_size each walk the chain on their own; fusing
+    them halves the DIE traversals per struct member and back-fills both caches.
+    """
+    global extracted_dies
+    types_cache = extracted_dies["types"]
+    if die.offset in types_cache and die.offset in already_extracted_size:
+        return types_cache[die.offset], already_extracted_size[die.offset]
+
+    terminal, chain = _resolve_typedef_chain(die)
+    ret_type = extract_type(terminal)
+    ret_size = extract_type_size(terminal)
+
+    if _cache_enabled:
+        for offset in chain:
+            types_cache[offset] = ret_type
+            already_extracted_size[offset] = ret_size
+    return ret_type, ret_size
+
+
 def extract_type_size(die):
     if die.offset in already_extracted_size:
         return already_extracted_size[die.offset]
@@ -174,16 +289,15 @@ def extract_type_size(die):
     elif die.tag == "DW_TAG_structure_type":
         if "DW_AT_byte_size" in die.attributes:
             ret = 8 * die.attributes["DW_AT_byte_size"].value
-    already_extracted_size[die.offset] = ret
+    if _cache_enabled:
+        already_extracted_size[die.offset] = ret
     return ret
 
 
 def extract_structure(die):
-    ret = dc.Struct()
-    ret.size = extract_type_size(die)
-    ret.members = collections.OrderedDict()
+    ret = dc.Struct(size=extract_type_size(die))
 
-    for member_die in die.iter_children():
+    for member_die in _children_of(die):
         if member_die.tag != "DW_TAG_member":
             continue
         if not die_has_name(member_die):
@@ -191,8 +305,7 @@ def extract_structure(die):
         else:
             member_name = get_die_name(member_die)
         member_type_die = get_type_die(member_die)
-        member_type = extract_type(member_type_die)
-        member_type_size = extract_type_size(member_type_die)
+        member_type, member_type_size = extract_type_and_size(member_type_die)
         byte_offset = member_die.attributes["DW_AT_data_member_location"].value
 
         if "DW_AT_bit_size" in member_die.attributes:
@@ -204,45 +317,39 @@ def extract_structure(die):
             field_size = member_die.attributes["DW_AT_bit_size"].value
             die_bit_offset = member_die.attributes["DW_AT_bit_offset"].value
 
-            if die_bit_offset & OFFSET_NEG_MASK:
-                # Negative offset; convert to positive.
-                die_bit_offset -= OFFSET_NEG_SUB
+            # Branchless two's-complement sign extension: XOR with the sign bit
+            # then subtract it, which leaves non-negative values untouched.
+            die_bit_offset = (die_bit_offset ^ OFFSET_NEG_MASK) - OFFSET_NEG_MASK
             field_offset_le = container_size - field_size - die_bit_offset + 8 * byte_offset
 
-            ret.members[member_name] = dc.BitField(
-                {
-                    "type": member_type,
-                    "size": field_size,
-                    "bit_offset": field_offset_le,
-                }
-            )
+            ret.add_member(member_name, member_type, field_size, field_offset_le)
 
             assert member_type_size is None or (field_size <= member_type_size), (
                 "Bit size assumption wrong!"
             )
         else:
-            ret.members[member_name] = dc.BitField(
-                {
-                    "type": member_type,
-                    "size": member_type_size,
-                    "bit_offset": 8 * byte_offset,
-                }
-            )
+            ret.add_member(member_name, member_type, member_type_size, 8 * byte_offset)
 
     return ret
 
 
-base_types = {
-    1: ctypes.c_uint8,
-    2: ctypes.c_uint16,
-    4: ctypes.c_uint32,
-    8: ctypes.c_uint64,
-    16: [ctypes.c_uint64] * 2,
-}
+# Base types as a flat table indexed by byte size; the lookup is hot enough
+# that skipping the dict hashing is worth it. Unsupported sizes hold None.
+base_types = [None] * 17
+base_types[1] = ctypes.c_uint8
+base_types[2] = ctypes.c_uint16
+base_types[4] = ctypes.c_uint32
+base_types[8] = ctypes.c_uint64
+base_types[16] = dc.Array(ctypes.c_uint64, (2,))
 
 
 def extract_base_type(die):
-    return base_types[die.attributes["DW_AT_byte_size"].value]
+    size = die.attributes["DW_AT_byte_size"].value
+    ret = base_types[size] if size < len(base_types) else None
+    if ret is None:
+        # Same failure mode as the former dict lookup
+        raise KeyError(size)
+    return ret
 
 
 def extract_array(die):
@@ -252,7 +359,7 @@ def extract_array(die):
 
     # Get member count in the next DIEs
     member_count = []
-    for member_count_die in die.iter_children():
+    for member_count_die in _children_of(die):
         if "DW_TAG_subrange_type" != member_count_die.tag:
             continue
         if "DW_AT_upper_bound" in member_count_die.attributes:
@@ -266,10 +373,9 @@ def extract_array(die):
             count = member_count_die.attributes["DW_AT_count"].value
             member_count.append(count)
 
-    ret = member_type
-    for dim in member_count[::-1]:
-        ret = [ret] * dim
-    return ret
+    if not member_count:
+        return member_type
+    return dc.Array(member_type, tuple(member_count))
 
 
 def extract_enum_type(die):
@@ -287,20 +393,22 @@ def extract_enum_values(die):
         return extracted_dies["enums"][die.offset]
 
     ret = {}
-    for member_die in die.iter_children():
+    for member_die in _children_of(die):
         if "DW_TAG_enumerator" != member_die.tag:
             continue
-        enum_name = get_die_name(member_die)
-        enum_value = member_die.attributes["DW_AT_const_value"].value
-        ret[enum_name] = enum_value
+        # Bind the attribute dict once per enumerator and decode through the
+        # memoized helper; big enums make this loop surprisingly hot.
+        attrs = member_die.attributes
+        ret[_decode_name_bytes(attrs["DW_AT_name"].value)] = attrs["DW_AT_const_value"].value
 
-    extracted_dies["enums"][die.offset] = ret
+    if _cache_enabled:
+        extracted_dies["enums"][die.offset] = ret
     return ret
 
 
 def extract_union(die):
     ret = dc.Union()
-    for member_die in die.iter_children():
+    for member_die in _children_of(die):
         if "DW_TAG_member" != member_die.tag:
             continue
         if not die_has_name(member_die):
@@ -313,6 +421,17 @@ def extract_union(die):
     return ret
 
 
+# Tag dispatch table for extract_type. A single dict lookup replaces the chain
+# of tag string comparisons that ran for every non-cached DIE.
+_type_extractors = {
+    "DW_TAG_structure_type": extract_structure,
+    "DW_TAG_base_type": extract_base_type,
+    "DW_TAG_array_type": extract_array,
+    "DW_TAG_enumeration_type": extract_enum_type,
+    "DW_TAG_union_type": extract_union,
+}
+
+
 def die_has_type(die):
     return "DW_AT_type" in die.attributes
 
@@ -322,9 +441,14 @@ def get_type_die(die):
 
 
 def get_die_at_offset(die, offset_attr: str):
-    return die.dwarfinfo.get_DIE_from_refaddr(
-        die.cu.cu_offset + die.attributes[offset_attr].value, die.cu
-    )
+    cu = die.cu
+    refaddr = cu.cu_offset + die.attributes[offset_attr].value
+    ret = _die_cache.get((cu.cu_offset, refaddr))
+    if ret is None:
+        ret = die.dwarfinfo.get_DIE_from_refaddr(refaddr, cu)
+        if _cache_enabled:
+            _die_cache[(cu.cu_offset, refaddr)] = ret
+    return ret
 
 
 def get_next_die(die):
@@ -335,8 +459,15 @@ def die_has_name(die):
     return "DW_AT_name" in die.attributes
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def _decode_name_bytes(name):
+    # Name bytes repeat heavily (same types, same member names across units);
+    # memoizing skips the repeated decode and interns the resulting strings.
+    return name.decode()
+
+
 def get_die_name(die):
-    return die.attributes["DW_AT_name"].value.decode()
+    return _decode_name_bytes(die.attributes["DW_AT_name"].value)
 
 
 def get_anon_name(die):
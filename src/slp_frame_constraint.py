@@ -48,30 +48,42 @@ def base_mode_frame(self: dp.BfUnion) -> None:
     self.fields.id = 0
 
 
+def _to_self_expr(expr: str) -> str:
+    """Rewrite the user-facing frame. prefix to the descriptor's self. namespace.
+
+    Runs once per expression while a test's constraints are parsed; the compiled
+    result is what the randomization loop re-evaluates.
+    """
+    return expr.replace(FRAME_CNSTR_PREFIX, "self.")
+
+
 def gen_user_constr(constrs: list[str]) -> vsc.constraint_t:
     """Apply user level constraints imported from yml test config."""
+    # Compile once here; the block below re-runs on every randomization
+    code_objs = [compile(expr, "<constraint>", "eval") for expr in constrs]
 
     # Return a clojure that can be run on the descriptor to add constraints
     @vsc.constraint
     def user_constr(self: dp.BfDtype) -> None:  # noqa: ARG001 Will be used by the expr
         enm = dp.enm  # noqa: F841 Used by the expr
 
-        for expr in constrs:
-            eval(expr)  # noqa: S307 expr is a constraint read by vsc.
+        for code in code_objs:
+            eval(code)  # noqa: S307 expr is a constraint read by vsc.
 
     return user_constr
 
 
 def gen_idx_constr(constrs: dict[str, str]) -> vsc.dynamic_constraint_t:
     """Generate a constraint block with given constraints."""
-    constrs = [x.replace(FRAME_CNSTR_PREFIX, "self.") for x in constrs.values()]
+    # Compile once here; the block below re-runs on every randomization
+    code_objs = [compile(_to_self_expr(x), "<constraint>", "eval") for x in constrs.values()]
 
     @vsc.dynamic_constraint
     def idx_constr(self: dp.BfUnion) -> None:  # noqa: ARG001 Will be used by the expr
         enm = dp.enm  # noqa: F841 Used by the expr
 
-        for expr in constrs:
-            eval(expr)  # noqa: S307 expr is a constraint read by vsc.
+        for code in code_objs:
+            eval(code)  # noqa: S307 expr is a constraint read by vsc.
 
     return idx_constr
 
@@ -87,7 +99,7 @@ def parse_cfg(cfg: dict) -> tuple[list[str], list[str]]:
     # Validate and process user constraints
     for name, expr in cfg.get(FRAME_CONSTR_KEY, {}).items():
         if FRAME_CNSTR_PREFIX in expr:
-            modified_expr = expr.replace(FRAME_CNSTR_PREFIX, "self.")
+            modified_expr = _to_self_expr(expr)
             logging.debug("Constraint: %s is %s", name, modified_expr)
             constr_exprs.append(modified_expr)
     return rnd_vars, constr_exprs
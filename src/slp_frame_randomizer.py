@@ -2,29 +2,58 @@
 # Licensed under the MIT License.
 """Code to randomize frames."""
 
+# ruff: noqa: SLF001 # "_" prepended members of BfType are internal to Sleipnir, not private.
+
 import logging
+import random
 from collections.abc import Generator
 from collections.abc import Iterator
 
+import numpy as np
+
 import slp_composer as composer
 import slp_dwarf_parser as dp
 import slp_frame_constraint as frame_cnstr
 
+RNG_BATCH = 1024
+"""Number of frames worth of random values drawn per batched RNG call."""
+
 
 def randomize_frames(
     frames: Generator,
     rnd_cfg: dict,
 ) -> Iterator[dp.BfStruct]:
-    """Randomize the frames."""
+    """Randomize the frames.
+
+    When the user supplied no constraint configuration, values are drawn in large
+    batches directly from the RNG, applying the base rules without engaging the
+    constraint solver at all. The solver path is used whenever user constraints
+    are present (or the frame type is not the one the base rules describe).
+    """
     rand_desc = composer.get_frame_obj()
     rand_desc.pre_rand()
+
+    if not rnd_cfg and (plan := _build_batch_plan(rand_desc)) is not None:
+        return _randomize_frames_batched(frames, plan)
+
+    return _randomize_frames_vsc(frames, rand_desc, rnd_cfg)
+
+
+def _randomize_frames_vsc(
+    frames: Generator,
+    rand_desc: dp.BfUnion,
+    rnd_cfg: dict,
+) -> Iterator[dp.BfStruct]:
+    """Randomize the frames with the vsc constraint solver."""
     frame_cnstr.add_cnstr(rand_desc, rnd_cfg)
 
     for cmd_idx, frame in enumerate(frames):
         with rand_desc.randomize_with() as it:
-            # Add the per cmd constraints here for this index
-            if hasattr(it, frame_cnstr.IDX_CONSTR_NAME.format(cmd_idx)):
-                getattr(it, frame_cnstr.IDX_CONSTR_NAME.format(cmd_idx))()
+            # Add the per cmd constraints here for this index; one getattr
+            # instead of a hasattr/getattr pair formatting the name twice
+            idx_constr = getattr(it, frame_cnstr.IDX_CONSTR_NAME.format(cmd_idx), None)
+            if idx_constr is not None:
+                idx_constr()
 
         rand_desc.post_rand()
 
@@ -36,11 +65,136 @@ def randomize_frames(
         yield frame
 
 
+def _collect_rand_leaves(member: dp.BfType, base_offset: int = 0) -> list:
+    """Return (leaf, absolute bit offset) pairs for all randomizable leaves."""
+    if isinstance(member, dp.BfDtype):
+        return [(member, base_offset)]
+    if isinstance(member, dp.BfStruct):
+        return [
+            pair
+            for child, offset, _, _ in member._layout
+            if child._int_field_info.is_rand
+            for pair in _collect_rand_leaves(child, base_offset + offset)
+        ]
+    if isinstance(member, dp.BfArray):
+        size = member._elem_size
+        return [
+            pair
+            for index, child in enumerate(member)
+            if child._int_field_info.is_rand
+            for pair in _collect_rand_leaves(child, base_offset + index * size)
+        ]
+    # BfUnion: pre_rand leaves exactly one member enabled for randomization
+    for name in member._member_names:
+        child = object.__getattribute__(member, name)
+        if child._int_field_info.is_rand:
+            return _collect_rand_leaves(child, base_offset)
+    return []
+
+
+def _build_batch_plan(rand_desc: dp.BfUnion) -> tuple | None:
+    """Precompute the leaf layout needed to randomize frames without the solver.
+
+    Returns None when the frame does not expose the fields the base constraints
+    refer to, in which case the caller has to fall back to the solver path.
+    """
+    # Same rand_mode defaults as the solver path (id is pinned, not randomized)
+    frame_cnstr.base_mode_frame(rand_desc)
+
+    try:
+        type_leaf = composer.fqn2field(rand_desc, "frame.fields.type")
+        count_leaf = composer.fqn2field(rand_desc, "frame.fields.count")
+        min_one_ids = {
+            id(composer.fqn2field(rand_desc, "frame.fields." + name))
+            for name in ("count", "width", "height", "depth")
+        }
+        frame_single = dp.enm.FRAME_SINGLE
+    except AttributeError:
+        logging.info("frame type lacks the base constraint fields, using the solver")
+        return None
+
+    # Fields whose rand_mode base_mode_frame disabled (fields.id) keep their
+    # assigned value instead of getting a draw. The rand_mode setter writes
+    # model.rand_mode, and the solver randomizes a field only when that and
+    # is_declared_rand are both set (FieldScalarModel.set_used_rand); mirror it.
+    pinned_val = 0
+    leaves = []
+    for leaf, offset in _collect_rand_leaves(rand_desc):
+        model = leaf._int_field_info.model
+        if model is not None and not (model.is_declared_rand and model.rand_mode):
+            pinned_val |= leaf.get_val() << offset
+        else:
+            leaves.append((leaf, offset))
+
+    leaf_ids = [id(leaf) for leaf, _ in leaves]
+    try:
+        type_idx = leaf_ids.index(id(type_leaf))
+        count_idx = leaf_ids.index(id(count_leaf))
+    except ValueError:
+        logging.info("type/count fields are not randomized, using the solver")
+        return None
+
+    # The dimension and count fields get a lower bound of 1, like base_constr_frame
+    lows = [1 if leaf_id in min_one_ids else 0 for leaf_id in leaf_ids]
+    return leaves, pinned_val, lows, type_idx, count_idx, frame_single
+
+
+def _randomize_frames_batched(frames: Generator, plan: tuple) -> Iterator[dp.BfStruct]:
+    """Randomize the frames from batched RNG draws, bypassing the solver.
+
+    The RNG is seeded from the global random module so runs stay reproducible
+    from the suite seed.
+    """
+    leaves, pinned_val, lows, type_idx, count_idx, frame_single = plan
+    rng = np.random.default_rng(random.getrandbits(64))
+    highs = [leaf._max_val - 1 for leaf, _ in leaves]
+
+    batch = None
+    batch_idx = RNG_BATCH
+    for cmd_idx, frame in enumerate(frames):
+        if batch_idx == RNG_BATCH:
+            # One RNG call covers the next RNG_BATCH frames for all leaves at once
+            batch = rng.integers(
+                lows, highs, size=(RNG_BATCH, len(leaves)), dtype=np.uint64, endpoint=True
+            )
+            batch_idx = 0
+        row = batch[batch_idx]
+        batch_idx += 1
+
+        # Single frames carry a count of one, mirroring base_constr_frame
+        if row[type_idx] == frame_single:
+            row[count_idx] = 1
+
+        new_value = pinned_val
+        for (_, offset), val in zip(leaves, row, strict=True):
+            new_value |= int(val) << offset
+
+        frame.set_val(new_value)
+        frame.id = cmd_idx & 0xFFFF_FFFF
+
+        log_shape_access(frame)
+
+        yield frame
+
+
 def log_shape_access(desc: dp.BfUnion) -> None:
     """Utility function for logging a frame's attributes.
 
     Args:
         desc (Bf.Union): Frame object to log.
     """
-    msg = f"Frame Id: {desc.fields.id}: (FrameType){desc.fields.type}, Dim: {desc.fields.width}x{desc.fields.height}x{desc.fields.depth}, Count: {desc.fields.count}"  # noqa: E501 Cannot compress further
-    logging.debug(msg)
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        # Reading the fields costs a descriptor-protocol walk each; skip it all
+        # when debug logging is off, which is the common case.
+        return
+
+    fields = desc.fields
+    logging.debug(
+        "Frame Id: %s: (FrameType)%s, Dim: %sx%sx%s, Count: %s",
+        fields.id,
+        fields.type,
+        fields.width,
+        fields.height,
+        fields.depth,
+        fields.count,
+    )
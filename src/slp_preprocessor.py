@@ -25,7 +25,12 @@ yaml.representer.ignore_aliases = lambda *args: True  # noqa: ARG005 # Need to m
 
 
 def process_in_yaml(input_yml: str) -> dict:
-    """Read input yml."""
+    """Read input yml.
+
+    The round-trip loader is intentional: sleipnir.main dumps the suite back out,
+    and the user's comments and scalar formatting survive that only if the loaded
+    objects carry them. A safe loader would parse faster but lose both.
+    """
     logging.debug("Reading input YAML %s", input_yml)
     with pathlib.Path(input_yml).open(mode="r") as input_file:
         suite = yaml.load(input_file)
@@ -44,11 +44,9 @@ def gen_frames(test: dict) -> None:
     """
 
     frames = composer.gen_frames(num_cmds)
-    frames = list(
-        frame_randomizer.randomize_frames(
-            frames,
-            rnd_cfg,
-        )
+    frames = frame_randomizer.randomize_frames(
+        frames,
+        rnd_cfg,
     )
 
     bin_name_frame, _ = dp.gen_bin_yaml_output_frame(file_prefix, frames)